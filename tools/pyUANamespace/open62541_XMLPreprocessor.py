@@ -22,7 +22,10 @@
 import logging
 from ua_constants import *
 import tempfile
-import xml.dom.minidom as dom
+try:
+  import xml.etree.cElementTree as etree
+except ImportError:
+  import xml.etree.ElementTree as etree
 import os
 import string
 from collections import Counter
@@ -36,7 +39,8 @@ logger = logging.getLogger(__name__)
 class preProcessDocument:
   originXML = '' # Original XML passed to the preprocessor
   targetXML = () # tuple of (fileHandle, fileName)
-  nodeset   = '' # Parsed DOM XML object
+  nodeset   = '' # Parsed ElementTree root element (<UANodeSet>)
+  nodesetXmlns = [] # contains xmlns declarations of the root element as tuples (string prefix, string uri)
   parseOK   = False;
   containedNodes  = [] # contains tuples of (opcua_node_id_t, xmlelement)
   referencedNodes = [] # contains tuples of (opcua_node_id_t, xmlelement)
@@ -53,15 +57,48 @@ class preProcessDocument:
     self.namespaceOrder  = []
     self.referencedNamesSpaceUris = []
     self.namespaceQualifiers = []
+    self.nodesetXmlns = []
     try:
-      self.nodeset = dom.parse(originXML)
-      if len(self.nodeset.getElementsByTagName("UANodeSet")) == 0 or len(self.nodeset.getElementsByTagName("UANodeSet")) > 1:
-        logger.error(self, "Document " + self.targetXML[1] + " contains no or more then 1 nodeset", LOG_LEVEL_ERROR)
+      self.nodeset = self.parseNodeset(originXML)
+      if self.nodeset.tag != "UANodeSet":
+        logger.error("Document " + self.targetXML[1] + " contains no nodeset")
         self.parseOK   = False
     except:
       self.parseOK   = False
     logger.debug("Adding new document to be preprocessed " + os.path.basename(originXML) + " as " + self.targetXML[1])
 
+  def parseNodeset(self, originXML):
+    """ parseNodeset
+
+        Reads the XML document originXML into an ElementTree and removes the XML
+        namespace qualifiers from all tags and attribute names (i.e. "<uax:Int32>"
+        becomes "<Int32>"). The xmlns declarations of the root element are kept
+        in nodesetXmlns, as ElementTree does not report them as attributes, and
+        the <Uri> entries of <NamespaceUris> are collected in
+        referencedNamesSpaceUris.
+
+        returns: The root element of the document
+    """
+    root = None
+    for (event, data) in etree.iterparse(originXML, events=("start-ns", "start")):
+      if event == "start-ns":
+        if root == None:
+          self.nodesetXmlns.append(data)
+      elif root == None:
+        root = data
+
+    for el in root.iter():
+      el.tag = el.tag.rpartition("}")[2]
+      for at in list(el.attrib.keys()):
+        if at[:1] == "{":
+          el.set(at.rpartition("}")[2], el.attrib.pop(at))
+
+    uris = root.find("NamespaceUris")
+    if uris != None:
+      for uri in uris:
+        self.referencedNamesSpaceUris.append(uri.text)
+    return root
+
   def clean(self):
     #os.close(self.targetXML[0]) Don't -> done to flush() after finalize()
     os.remove(self.targetXML[1])
@@ -71,39 +108,6 @@ class preProcessDocument:
       return self.targetXML[1]
     return None
 
-  def extractNamespaceURIs(self):
-    """ extractNamespaceURIs
-
-        minidom gobbles up <NamespaceUris></NamespaceUris> elements, without a decent
-        way to reliably access this dom2 <uri></uri> elements (only attribute xmlns= are
-        accessible using minidom).  We need them for dereferencing though... This
-        function attempts to do just that.
-
-        returns: Nothing
-    """
-    infile = open(self.originXML)
-    foundURIs = False
-    nsline = ""
-    line = infile.readline()
-    for line in infile:
-      if "<namespaceuris>" in line.lower():
-        foundURIs = True
-      elif "</namespaceuris>" in line.lower():
-        foundURIs = False
-        nsline = nsline + line
-        break
-      if foundURIs:
-        nsline = nsline + line
-
-    if len(nsline) > 0:
-      ns = dom.parseString(nsline).getElementsByTagName("NamespaceUris")
-      for uri in ns[0].childNodes:
-        if uri.nodeType != uri.ELEMENT_NODE:
-          continue
-        self.referencedNamesSpaceUris.append(uri.firstChild.data)
-
-    infile.close()
-
   def analyze(self):
     """ analyze()
 
@@ -113,28 +117,23 @@ class preProcessDocument:
         returns: No return value
     """
     nodeIds = []
-    ns = self.nodeset.getElementsByTagName("UANodeSet")
 
     # We need to find out what the namespace calls itself and other referenced, as numeric id's are pretty
-    # useless sans linked nodes. There is two information sources...
-    self.extractNamespaceURIs() # From <URI>...</URI> definitions
-
-    for key in ns[0].attributes.keys(): # from xmlns:sX attributes
-      if "xmlns:" in key:  # Any key: we will be removing these qualifiers from Values later
-        self.namespaceQualifiers.append(key.replace("xmlns:",""))
-      if "xmlns:s" in key: # get a numeric nsId and modelname/uri
-        self.namespaceOrder.append((int(key.replace("xmlns:s","")), re.sub("[A-Za-z0-9-_\.]+\.[xXsSdD]{3}$","",ns[0].getAttribute(key))))
+    # useless sans linked nodes. There is two information sources: The <URI>...</URI>
+    # definitions (already collected by parseNodeset) and the xmlns:sX attributes.
+    for (prefix, uri) in self.nodesetXmlns: # from xmlns:sX attributes
+      if prefix != "":  # Any prefix: these qualifiers have already been removed from the tags
+        self.namespaceQualifiers.append(prefix)
+      if prefix[:1] == "s": # get a numeric nsId and modelname/uri
+        self.namespaceOrder.append((int(prefix[1:]), re.sub("[A-Za-z0-9-_\.]+\.[xXsSdD]{3}$","",uri)))
 
     # Get all nodeIds contained in this XML
-    for nd in ns[0].childNodes:
-      if nd.nodeType != nd.ELEMENT_NODE:
-        continue
-      if nd.hasAttribute(u'NodeId'):
-        self.containedNodes.append( (opcua_node_id_t(nd.getAttribute(u'NodeId')), nd) )
-        refs = nd.getElementsByTagName(u'References')[0]
-        for ref in refs.childNodes:
-          if ref.nodeType == ref.ELEMENT_NODE:
-            self.referencedNodes.append( (opcua_node_id_t(ref.firstChild.data), ref) )
+    for nd in self.nodeset:
+      if nd.get(u'NodeId') != None:
+        self.containedNodes.append( (opcua_node_id_t(nd.get(u'NodeId')), nd) )
+        refs = nd.find(u'.//References')
+        for ref in refs:
+          self.referencedNodes.append( (opcua_node_id_t(ref.text), ref) )
 
     logger.debug("Nodes: " + str(len(self.containedNodes)) + " References: " + str(len(self.referencedNodes)))
 
@@ -192,13 +191,9 @@ class preProcessDocument:
     return deps
 
   def finalize(self):
-    outfile = self.targetXML[0]
-    outline = self.nodeset.toxml()
-    for qualifier in self.namespaceQualifiers:
-      rq = qualifier+":"
-      outline = outline.replace(rq, "")
-    os.write(outfile, outline.encode('UTF-8'))
-    os.close(outfile)
+    outfile = os.fdopen(self.targetXML[0], "wb")
+    etree.ElementTree(self.nodeset).write(outfile, encoding="UTF-8")
+    outfile.close()
 
   def reassignReferencedNamespaceId(self, currentNsId, newNsId):
     """ reassignReferencedNamespaceId
@@ -210,7 +205,7 @@ class preProcessDocument:
     """
     for refNd in self.referencedNodes:
       if refNd[0].ns == currentNsId:
-        refNd[1].firstChild.data = refNd[1].firstChild.data.replace("ns="+str(currentNsId), "ns="+str(newNsId))
+        refNd[1].text = refNd[1].text.replace("ns="+str(currentNsId), "ns="+str(newNsId))
         refNd[0].ns = newNsId
         refNd[0].toString()
 
@@ -223,11 +218,10 @@ class preProcessDocument:
     """
 
     #change ids in aliases
-    ns = self.nodeset.getElementsByTagName("Alias")
+    ns = self.nodeset.iter("Alias")
     for al in ns:
-      if al.nodeType == al.ELEMENT_NODE:
-        if al.hasAttribute("Alias"):
-          al.firstChild.data = al.firstChild.data.replace("ns=" + str(currentNsId), "ns=" + str(newNsId))
+      if al.get("Alias") != None:
+        al.text = al.text.replace("ns=" + str(currentNsId), "ns=" + str(newNsId))
 
     logger.debug("Migrating nodes /w ns index " + str(currentNsId) + " to " + str(newNsId))
     for nd in self.containedNodes:
@@ -235,10 +229,10 @@ class preProcessDocument:
         # In our own document, update any references to this node
         for refNd in self.referencedNodes:
           if refNd[0].ns == currentNsId and refNd[0] == nd[0]:
-            refNd[1].firstChild.data = refNd[1].firstChild.data.replace("ns="+str(currentNsId), "ns="+str(newNsId))
+            refNd[1].text = refNd[1].text.replace("ns="+str(currentNsId), "ns="+str(newNsId))
             refNd[0].ns = newNsId
             refNd[0].toString()
-        nd[1].setAttribute(u'NodeId', nd[1].getAttribute(u'NodeId').replace("ns="+str(currentNsId), "ns="+str(newNsId)))
+        nd[1].set(u'NodeId', nd[1].get(u'NodeId').replace("ns="+str(currentNsId), "ns="+str(newNsId)))
         nd[0].ns = newNsId
         nd[0].toString()
 
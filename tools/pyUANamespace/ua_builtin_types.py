@@ -22,7 +22,10 @@
 ###
 
 import sys
-import xml.dom.minidom as dom
+try:
+  import xml.etree.cElementTree as etree
+except ImportError:
+  import xml.etree.ElementTree as etree
 from ua_constants import *
 import logging
 from time import strftime, strptime
@@ -30,14 +33,6 @@ from open62541_MacroHelper import open62541_MacroHelper
 
 logger = logging.getLogger(__name__)
 
-def getNextElementNode(xmlvalue):
-  if xmlvalue == None:
-    return None
-  xmlvalue = xmlvalue.nextSibling
-  while not xmlvalue == None and not xmlvalue.nodeType == xmlvalue.ELEMENT_NODE:
-    xmlvalue = xmlvalue.nextSibling
-  return xmlvalue
-
 if sys.version_info[0] >= 3:
   # strings are already parsed to unicode
   def unicode(s):
@@ -175,24 +170,19 @@ class opcua_value_t():
   def parseXML(self, xmlvalue):
     logger.debug("parsing xmlvalue for " + self.parent.browseName() + " (" + str(self.parent.id()) + ") according to " + str(self.parent.dataType().target().getEncoding()))
 
-    if not "value" in xmlvalue.tagName.lower():
-      logger.error("Expected <Value> , but found " + xmlvalue.tagName + " instead. Value will not be parsed.")
+    if not "value" in xmlvalue.tag.lower():
+      logger.error("Expected <Value> , but found " + xmlvalue.tag + " instead. Value will not be parsed.")
       return
 
-    if len(xmlvalue.childNodes) == 0:
+    if len(xmlvalue) == 0:
       logger.error("Expected childnodes for value, but none where found... Value will not be parsed.")
       return
 
-    for n in xmlvalue.childNodes:
-      if n.nodeType == n.ELEMENT_NODE:
-        xmlvalue = n
-        break
+    xmlvalue = xmlvalue[0]
 
-    if "ListOf" in xmlvalue.tagName:
+    if "ListOf" in xmlvalue.tag:
       self.value = []
-      for el in xmlvalue.childNodes:
-        if not el.nodeType == el.ELEMENT_NODE:
-          continue
+      for el in xmlvalue:
         self.value.append(self.__parseXMLSingleValue(el))
     else:
       self.value = [self.__parseXMLSingleValue(xmlvalue)]
@@ -222,8 +212,8 @@ class opcua_value_t():
       if isinstance(enc[0], str):
         # 0: 'BuiltinType'
         if alias != None:
-          if not xmlvalue.tagName == alias:
-            logger.error("Expected XML element with tag " + alias + " but found " + xmlvalue.tagName + " instead")
+          if not xmlvalue.tag == alias:
+            logger.error("Expected XML element with tag " + alias + " but found " + xmlvalue.tag + " instead")
             return None
           else:
             t = self.getTypeByString(enc[0], enc)
@@ -231,8 +221,8 @@ class opcua_value_t():
             t.parseXML(xmlvalue)
             return t
         else:
-          if not self.isBuiltinByString(xmlvalue.tagName):
-            logger.error("Expected XML describing builtin type " + enc[0] + " but found " + xmlvalue.tagName + " instead")
+          if not self.isBuiltinByString(xmlvalue.tag):
+            logger.error("Expected XML describing builtin type " + enc[0] + " but found " + xmlvalue.tag + " instead")
           else:
             t = self.getTypeByString(enc[0], enc)
             t.parseXML(xmlvalue)
@@ -259,60 +249,55 @@ class opcua_value_t():
       #        OPCUA Namespace 0 nodeset.
       #        Consider moving this ExtensionObject specific parsing into the
       #        builtin type and only determining the multipart type at this stage.
-      if not xmlvalue.tagName == "ExtensionObject":
-        logger.error("Expected XML tag <ExtensionObject> for multipart type, but found " + xmlvalue.tagName + " instead.")
+      if not xmlvalue.tag == "ExtensionObject":
+        logger.error("Expected XML tag <ExtensionObject> for multipart type, but found " + xmlvalue.tag + " instead.")
         return None
 
       extobj = opcua_BuiltinType_extensionObject_t(self.parent)
       extobj.setEncodingRule(enc)
-      etype = xmlvalue.getElementsByTagName("TypeId")
+      etype = xmlvalue.findall(".//TypeId")
       if len(etype) == 0:
         logger.error("Did not find <TypeId> for ExtensionObject")
         return None
-      etype = etype[0].getElementsByTagName("Identifier")
+      etype = etype[0].findall(".//Identifier")
       if len(etype) == 0:
         logger.error("Did not find <Identifier> for ExtensionObject")
         return None
-      etype = self.parent.getNamespace().getNodeByIDString(etype[0].firstChild.data)
+      etype = self.parent.getNamespace().getNodeByIDString(etype[0].text)
       if etype == None:
         logger.error("Identifier Node not found in namespace" )
         return None
 
       extobj.typeId(etype)
 
-      ebody = xmlvalue.getElementsByTagName("Body")
+      ebody = xmlvalue.findall(".//Body")
       if len(ebody) == 0:
         logger.error("Did not find <Body> for ExtensionObject")
         return None
       ebody = ebody[0]
 
       # Body must contain an Object of type 'DataType' as defined in Variable
-      ebodypart = ebody.firstChild
-      if not ebodypart.nodeType == ebodypart.ELEMENT_NODE:
-        ebodypart = getNextElementNode(ebodypart)
-      if ebodypart == None:
+      if len(ebody) == 0:
         logger.error("Expected ExtensionObject to hold a variable of type " + str(self.parent.dataType().target().browseName()) + " but found nothing.")
         return None
+      ebodypart = ebody[0]
 
-      if not ebodypart.tagName == self.parent.dataType().target().browseName():
-        logger.error("Expected ExtensionObject to hold a variable of type " + str(self.parent.dataType().target().browseName()) + " but found " + str(ebodypart.tagName) + " instead.")
+      if not ebodypart.tag == self.parent.dataType().target().browseName():
+        logger.error("Expected ExtensionObject to hold a variable of type " + str(self.parent.dataType().target().browseName()) + " but found " + str(ebodypart.tag) + " instead.")
         return None
-      extobj.alias(ebodypart.tagName)
+      extobj.alias(ebodypart.tag)
 
-      ebodypart = ebodypart.firstChild
-      if not ebodypart.nodeType == ebodypart.ELEMENT_NODE:
-        ebodypart = getNextElementNode(ebodypart)
-      if ebodypart == None:
+      ebodyfields = list(ebodypart)
+      if len(ebodyfields) == 0:
         logger.error("Description of dataType " + str(self.parent.dataType().target().browseName()) + " in ExtensionObject is empty/invalid.")
         return None
 
       extobj.value = []
-      for e in enc:
-        if not ebodypart == None:
-          extobj.value.append(extobj.__parseXMLSingleValue(ebodypart, alias=None, encodingPart=e))
+      for (i, e) in enumerate(enc):
+        if i < len(ebodyfields):
+          extobj.value.append(extobj.__parseXMLSingleValue(ebodyfields[i], alias=None, encodingPart=e))
         else:
           logger.error("Expected encoding " + str(e) + " but found none in body.")
-        ebodypart = getNextElementNode(ebodypart)
       return extobj
 
   def setStringReprentation(self):
@@ -552,18 +537,18 @@ class opcua_BuiltinType_localizedtext_t(opcua_value_t):
     #          <Text>TextText</Text>
     #        <LocalizedText> or </AliasName>
     #
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None and len(xmlvalue) == 0:
       if self.alias() != None:
         logger.debug("Neither locale nor text in XML description field " + self.alias() + ". Setting to default ['en_US','']")
       else:
@@ -572,32 +557,32 @@ class opcua_BuiltinType_localizedtext_t(opcua_value_t):
       return
 
     self.value = []
-    tmp = xmlvalue.getElementsByTagName("Locale")
+    tmp = xmlvalue.findall(".//Locale")
     if len(tmp) == 0:
       logger.warn("Did not find a locale. Setting to en_US per default.")
       self.value.append('en_US')
     else:
-      if tmp[0].firstChild == None:
+      if tmp[0].text == None:
         logger.warn("Locale tag without contents. Setting to en_US per default.")
         self.value.append('en_US')
       else:
-        self.value.append(tmp[0].firstChild.data)
+        self.value.append(tmp[0].text)
       clean = ""
       for s in self.value[0]:
         if s in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_":
           clean = clean + s
       self.value[0] = clean
 
-    tmp = xmlvalue.getElementsByTagName("Text")
+    tmp = xmlvalue.findall(".//Text")
     if len(tmp) == 0:
       logger.warn("Did not find a Text. Setting to empty string per default.")
       self.value.append('')
     else:
-      if tmp[0].firstChild == None:
+      if tmp[0].text == None:
         logger.warn("Text tag without content. Setting to empty string per default.")
         self.value.append('')
       else:
-        self.value.append(tmp[0].firstChild.data)
+        self.value.append(tmp[0].text)
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
       if asIndirect==True:
@@ -614,7 +599,7 @@ class opcua_BuiltinType_expandednodeid_t(opcua_value_t):
     self.__binTypeId__ = BUILTINTYPE_TYPEID_EXPANDEDNODEID
 
   def parseXML(self, xmlvalue):
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
@@ -638,28 +623,28 @@ class opcua_BuiltinType_nodeid_t(opcua_value_t):
     #                ns=x;i=y or similar string representation of id()
     #           </Identifier>
     #        </NodeId> or </Alias>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <NodeId />
-    if xmlvalue.firstChild == None :
+    if xmlvalue.text == None and len(xmlvalue) == 0:
       logger.error("No value is given, which is illegal for Node Types...")
       self.value = None
     else:
       # Check if there is an <Identifier> tag
-      if len(xmlvalue.getElementsByTagName("Identifier")) != 0:
-        xmlvalue = xmlvalue.getElementsByTagName("Identifier")[0]
-      self.value = self.parent.getNamespace().getNodeByIDString(unicode(xmlvalue.firstChild.data))
+      if len(xmlvalue.findall(".//Identifier")) != 0:
+        xmlvalue = xmlvalue.findall(".//Identifier")[0]
+      self.value = self.parent.getNamespace().getNodeByIDString(unicode(xmlvalue.text))
       if self.value == None:
-        logger.error("Node with id " + str(unicode(xmlvalue.firstChild.data)) + " was not found in namespace.")
+        logger.error("Node with id " + str(unicode(xmlvalue.text)) + " was not found in namespace.")
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     if self.value == None:
@@ -688,23 +673,23 @@ class opcua_BuiltinType_datetime_t(opcua_value_t):
     # Expect <DateTime> or <AliasName>
     #        2013-08-13T21:00:05.0000L
     #        </DateTime> or </AliasName>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <DateTime /> by setting the value to a default
-    if xmlvalue.firstChild == None :
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default now()")
       self.value = strptime(strftime("%Y-%m-%dT%H:%M%S"), "%Y-%m-%dT%H:%M%S")
     else:
-      timestr = unicode(xmlvalue.firstChild.data)
+      timestr = unicode(xmlvalue.text)
       # .NET tends to create this garbage %Y-%m-%dT%H:%M:%S.0000z
       # strip everything after the "." away for a posix time_struct
       if "." in timestr:
@@ -730,35 +715,35 @@ class opcua_BuiltinType_qualifiedname_t(opcua_value_t):
     #           <NamespaceIndex>Int16<NamespaceIndex> # Optional, apparently ommitted if ns=0 ??? (Not given in OPCUA Nodeset2)
     #           <Name>SomeString<Name>                # Speculation: Manditory if NamespaceIndex is given, omitted otherwise?
     #        </QualifiedName> or </AliasName>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Qalified /> by setting the value to a default
-    if xmlvalue.firstChild == None :
+    if xmlvalue.text == None and len(xmlvalue) == 0:
       logger.debug("No value is given. Setting to default empty string in ns=0: [0, '']")
       self.value = [0, '']
     else:
       # Is a namespace index passed?
-      if len(xmlvalue.getElementsByTagName("NamespaceIndex")) != 0:
-        self.value = [int(xmlvalue.getElementsByTagName("NamespaceIndex")[0].firstChild.data)]
+      if len(xmlvalue.findall(".//NamespaceIndex")) != 0:
+        self.value = [int(xmlvalue.findall(".//NamespaceIndex")[0].text)]
         # namespace index is passed and <Name> tags are now manditory?
-        if len(xmlvalue.getElementsByTagName("Name")) != 0:
-          self.value.append(xmlvalue.getElementsByTagName("Name")[0].firstChild.data)
+        if len(xmlvalue.findall(".//Name")) != 0:
+          self.value.append(xmlvalue.findall(".//Name")[0].text)
         else:
           logger.debug("No name is specified, will default to empty string")
           self.value.append('')
       else:
         logger.debug("No namespace is specified, will default to 0")
         self.value = [0]
-        self.value.append(unicode(xmlvalue.firstChild.data))
+        self.value.append(unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
       code = "UA_QUALIFIEDNAME_ALLOC(" + str(self.value[0]) + ", \"" + self.value[1].encode('utf-8') + "\")"
@@ -772,7 +757,7 @@ class opcua_BuiltinType_statuscode_t(opcua_value_t):
     self.__binTypeId__ = BUILTINTYPE_TYPEID_STATUSCODE
 
   def parseXML(self, xmlvalue):
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
     logger.warn("Not implemented")
@@ -785,7 +770,7 @@ class opcua_BuiltinType_diagnosticinfo_t(opcua_value_t):
     self.__binTypeId__ = BUILTINTYPE_TYPEID_DIAGNOSTICINFO
 
   def parseXML(self, xmlvalue):
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
     logger.warn("Not implemented")
@@ -798,23 +783,23 @@ class opcua_BuiltinType_guid_t(opcua_value_t):
     self.__binTypeId__ = BUILTINTYPE_TYPEID_GUID
 
   def parseXML(self, xmlvalue):
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Guid /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = [0,0,0,0]
     else:
-      self.value = unicode(xmlvalue.firstChild.data)
+      self.value = unicode(xmlvalue.text)
       self.value = self.value.replace("{","")
       self.value = self.value.replace("}","")
       self.value = self.value.split("-")
@@ -824,11 +809,11 @@ class opcua_BuiltinType_guid_t(opcua_value_t):
         try:
           tmp.append(int("0x"+g, 16))
         except:
-          logger.error("Invalid formatting of Guid. Expected {01234567-89AB-CDEF-ABCD-0123456789AB}, got " + unicode(xmlvalue.firstChild.data))
+          logger.error("Invalid formatting of Guid. Expected {01234567-89AB-CDEF-ABCD-0123456789AB}, got " + unicode(xmlvalue.text))
           self.value = [0,0,0,0,0]
           ok = False
       if len(tmp) != 5:
-        logger.error("Invalid formatting of Guid. Expected {01234567-89AB-CDEF-ABCD-0123456789AB}, got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Invalid formatting of Guid. Expected {01234567-89AB-CDEF-ABCD-0123456789AB}, got " + unicode(xmlvalue.text))
         self.value = [0,0,0,0]
         ok = False
       self.value = tmp
@@ -843,23 +828,23 @@ class opcua_BuiltinType_boolean_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Boolean>value</Boolean> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Boolean /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = "false"
     else:
-      if "false" in unicode(xmlvalue.firstChild.data).lower():
+      if "false" in unicode(xmlvalue.text).lower():
         self.value = "false"
       else:
         self.value = "true"
@@ -877,26 +862,26 @@ class opcua_BuiltinType_byte_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Byte>value</Byte> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Byte /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -911,26 +896,26 @@ class opcua_BuiltinType_sbyte_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <SByte>value</SByte> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <SByte /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -945,26 +930,26 @@ class opcua_BuiltinType_int16_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Int16>value</Int16> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Int16 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -979,26 +964,26 @@ class opcua_BuiltinType_uint16_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <UInt16>value</UInt16> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <UInt16 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1013,26 +998,26 @@ class opcua_BuiltinType_int32_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Int32>value</Int32> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Int32 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1047,26 +1032,26 @@ class opcua_BuiltinType_uint32_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <UInt32>value</UInt32> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <UInt32 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1082,21 +1067,21 @@ class opcua_BuiltinType_int64_t(opcua_value_t):
     # Expect <Int64>value</Int64> or
     #        <Aliasname>value</Aliasname>
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Int64 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1111,26 +1096,26 @@ class opcua_BuiltinType_uint64_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <UInt16>value</UInt16> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <UInt64 /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0
     else:
       try:
-        self.value = int(unicode(xmlvalue.firstChild.data))
+        self.value = int(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1145,26 +1130,26 @@ class opcua_BuiltinType_float_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Float>value</Float> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Float /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0.0
     else:
       try:
-        self.value = float(unicode(xmlvalue.firstChild.data))
+        self.value = float(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1179,26 +1164,26 @@ class opcua_BuiltinType_double_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <Double>value</Double> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <Double /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = 0.0
     else:
       try:
-        self.value = float(unicode(xmlvalue.firstChild.data))
+        self.value = float(unicode(xmlvalue.text))
       except:
-        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.firstChild.data))
+        logger.error("Error parsing integer. Expected " + self.stringRepresentation + " but got " + unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
     return "(UA_" + self.stringRepresentation + ") " + str(self.value)
@@ -1218,23 +1203,23 @@ class opcua_BuiltinType_string_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <String>value</String> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <String /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = ""
     else:
-      self.value = str(unicode(xmlvalue.firstChild.data))
+      self.value = str(unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
       code = "UA_STRING_ALLOC(\"" + self.value.encode('utf-8') + "\")"
@@ -1261,23 +1246,23 @@ class opcua_BuiltinType_bytestring_t(opcua_value_t):
   def parseXML(self, xmlvalue):
     # Expect <ByteString>value</ByteString> or
     #        <Aliasname>value</Aliasname>
-    if xmlvalue == None or xmlvalue.nodeType != xmlvalue.ELEMENT_NODE:
+    if xmlvalue == None:
       logger.error("Expected XML Element, but got junk...")
       return
 
     if self.alias() != None:
-      if not self.alias() == xmlvalue.tagName:
-        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.alias() == xmlvalue.tag:
+        logger.warn("Expected an aliased XML field called " + self.alias() + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
     else:
-      if not self.stringRepresentation == xmlvalue.tagName:
-        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tagName + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
+      if not self.stringRepresentation == xmlvalue.tag:
+        logger.warn("Expected XML field " + self.stringRepresentation + " but got " + xmlvalue.tag + " instead. This is a parsing error of opcua_value_t.__parseXMLSingleValue(), will try to continue anyway.")
 
     # Catch XML <ByteString /> by setting the value to a default
-    if xmlvalue.firstChild == None:
+    if xmlvalue.text == None:
       logger.debug("No value is given. Setting to default 0")
       self.value = ""
     else:
-      self.value = str(unicode(xmlvalue.firstChild.data))
+      self.value = str(unicode(xmlvalue.text))
 
   def printOpen62541CCode_SubType(self, asIndirect=True):
       bs = ""
@@ -24,6 +24,8 @@ from __future__ import print_function
 import sys
 from time import struct_time, strftime, strptime, mktime
 from struct import pack as structpack
+from collections import OrderedDict
+import heapq
 
 import logging
 from ua_builtin_types import *;
@@ -34,13 +36,17 @@ from open62541_MacroHelper import open62541_MacroHelper
 
 logger = logging.getLogger(__name__)
 
-def getNextElementNode(xmlvalue):
-  if xmlvalue == None:
-    return None
-  xmlvalue = xmlvalue.nextSibling
-  while not xmlvalue == None and not xmlvalue.nodeType == xmlvalue.ELEMENT_NODE:
-    xmlvalue = xmlvalue.nextSibling
-  return xmlvalue
+# Node classes instantiated by opcua_namespace.createNode() for each node type
+# (the lowercase XML tag without its "UA" prefix)
+__nodeClasses__ = { 'variable':      opcua_node_variable_t,
+                    'object':        opcua_node_object_t,
+                    'method':        opcua_node_method_t,
+                    'objecttype':    opcua_node_objectType_t,
+                    'variabletype':  opcua_node_variableType_t,
+                    'methodtype':    opcua_node_method_t,
+                    'datatype':      opcua_node_dataType_t,
+                    'referencetype': opcua_node_referenceType_t,
+                    'view':          opcua_node_view_t }
 
 ###
 ### Namespace Organizer
@@ -58,8 +64,8 @@ class opcua_namespace():
       space of the binary representation and all nodes that are to be included
       in that segment of memory.
   """
-  nodes = []
-  nodeids = {}
+  nodeids = OrderedDict() # 'string':node, in order of creation (or reorderNodesMinDependencies())
+  browsenames = {}
   aliases = {}
   __linkLater__ = []
   __binaryIndirectPointers__ = []
@@ -68,16 +74,22 @@ class opcua_namespace():
   namespaceIdentifiers = {} # list of 'int':'string' giving different namespace an array-mapable name
 
   def __init__(self, name):
-    self.nodes = []
     self.knownNodeTypes = ['variable', 'object', 'method', 'referencetype', \
                            'objecttype', 'variabletype', 'methodtype', \
                            'datatype', 'referencetype', 'aliases']
     self.name = name
-    self.nodeids = {}
+    self.nodeids = OrderedDict()
+    self.browsenames = {}
     self.aliases = {}
     self.namespaceIdentifiers = {}
     self.__binaryIndirectPointers__ = []
 
+  @property
+  def nodes(self):
+    """ List of all nodes in this namespace, in the order kept by nodeids.
+    """
+    return list(self.nodeids.values())
+
   def addNamespace(self, numericId, stringURL):
     self.namespaceIdentifiers[numericId] = stringURL
 
@@ -118,31 +130,31 @@ class opcua_namespace():
         Contents the Alias element are stored in a dictionary for further
         dereferencing during pointer linkage (see linkOpenPointer()).
     """
-    if not xmlelement.tagName == "Aliases":
+    if not xmlelement.tag == "Aliases":
       logger.error("XMLElement passed is not an Aliaslist")
       return
-    for al in xmlelement.childNodes:
-      if al.nodeType == al.ELEMENT_NODE:
-        if al.hasAttribute("Alias"):
-          aliasst = al.getAttribute("Alias")
-          if sys.version_info[0] < 3:
-            aliasnd = unicode(al.firstChild.data)
-          else:
-            aliasnd = al.firstChild.data
-          if not aliasst in self.aliases:
-            self.aliases[aliasst] = aliasnd
-            logger.debug("Added new alias \"" + str(aliasst) + "\" == \"" + str(aliasnd) + "\"")
-          else:
-            if self.aliases[aliasst] != aliasnd:
-              logger.error("Alias definitions for " + aliasst + " differ. Have " + self.aliases[aliasst] + " but XML defines " + aliasnd + ". Keeping current definition.")
+    for al in xmlelement:
+      aliasst = al.get("Alias")
+      if aliasst != None:
+        if sys.version_info[0] < 3:
+          aliasnd = unicode(al.text)
+        else:
+          aliasnd = al.text
+        if not aliasst in self.aliases:
+          self.aliases[aliasst] = aliasnd
+          logger.debug("Added new alias \"" + str(aliasst) + "\" == \"" + str(aliasnd) + "\"")
+        else:
+          if self.aliases[aliasst] != aliasnd:
+            logger.error("Alias definitions for " + aliasst + " differ. Have " + self.aliases[aliasst] + " but XML defines " + aliasnd + ". Keeping current definition.")
 
   def getNodeByBrowseName(self, idstring):
-    """ Returns the first node in the nodelist whose browseName matches idstring.
+    """ Returns the first node added to the namespace whose browseName matches
+        idstring.
+
+        Nodes are looked up in the browsenames index maintained by createNode()
+        and removeNodeById().
     """
-    matches = []
-    for n in self.nodes:
-      if idstring==str(n.browseName()):
-        matches.append(n)
+    matches = self.browsenames.get(idstring, [])
     if len(matches) > 1:
       logger.error("Found multiple nodes with same ID!?")
     if len(matches) == 0:
@@ -151,19 +163,20 @@ class opcua_namespace():
       return matches[0]
 
   def getNodeByIDString(self, idstring):
-    """ Returns the first node in the nodelist whose id string representation
-        matches idstring.
+    """ Returns the node whose id string representation matches idstring.
+
+        Nodes are looked up in the nodeids index maintained by createNode()
+        and removeNodeById().
     """
-    matches = []
-    for n in self.nodes:
-      if idstring==str(n.id()):
-        matches.append(n)
-    if len(matches) > 1:
-      logger.error("Found multiple nodes with same ID!?")
-    if len(matches) == 0:
-      return None
-    else:
-      return matches[0]
+    return self.nodeids.get(idstring, None)
+
+  def __unregisterNode__(self, node):
+    """ Removes node from the nodeids and browsenames indices.
+    """
+    self.nodeids.pop(str(node.id()), None)
+    matches = self.browsenames.get(str(node.browseName()), [])
+    if node in matches:
+      matches.remove(node)
 
   def createNode(self, ndtype, xmlelement):
     """ createNode is instantiates a node described by xmlelement, its type being
@@ -193,15 +206,15 @@ class opcua_namespace():
         If the NodeID attribute is non-unique in the node list, the creation is
         deferred and an error is logged.
     """
-    if not isinstance(xmlelement, dom.Element):
+    if not etree.iselement(xmlelement):
       logger.error( "Error: Can not create node from invalid XMLElement")
       return
 
     # An ID is mandatory for everything but aliases!
     id = None
     for idname in ['NodeId', 'NodeID', 'nodeid']:
-      if xmlelement.hasAttribute(idname):
-        id = xmlelement.getAttribute(idname)
+      if idname in xmlelement.attrib:
+        id = xmlelement.get(idname)
     if ndtype == 'aliases':
       self.buildAliasList(xmlelement)
       return
@@ -211,6 +224,11 @@ class opcua_namespace():
     else:
       id = opcua_node_id_t(id)
 
+    nodeClass = __nodeClasses__.get(ndtype, None)
+    if nodeClass == None:
+      logger.error( "No node constructor for type " + ndtype)
+      return
+
     if str(id) in self.nodeids:
       # Normal behavior: Do not allow duplicates, first one wins
       #logger.error( "XMLElement with duplicate ID " + str(id) + " found, node will not be created!")
@@ -218,34 +236,13 @@ class opcua_namespace():
       # Open62541 behavior for header generation: Replace the duplicate with the new node
       logger.info( "XMLElement with duplicate ID " + str(id) + " found, node will be replaced!")
       nd = self.getNodeByIDString(str(id))
-      self.nodes.remove(nd)
-      self.nodeids.pop(str(nd.id()))
-
-    node = None
-    if (ndtype == 'variable'):
-      node = opcua_node_variable_t(id, self)
-    elif (ndtype == 'object'):
-      node = opcua_node_object_t(id, self)
-    elif (ndtype == 'method'):
-      node = opcua_node_method_t(id, self)
-    elif (ndtype == 'objecttype'):
-      node = opcua_node_objectType_t(id, self)
-    elif (ndtype == 'variabletype'):
-      node = opcua_node_variableType_t(id, self)
-    elif (ndtype == 'methodtype'):
-      node = opcua_node_methodType_t(id, self)
-    elif (ndtype == 'datatype'):
-      node = opcua_node_dataType_t(id, self)
-    elif (ndtype == 'referencetype'):
-      node = opcua_node_referenceType_t(id, self)
-    else:
-      logger.error( "No node constructor for type " + ndtype)
+      self.__unregisterNode__(nd)
 
-    if node != None:
-      node.parseXML(xmlelement)
+    node = nodeClass(id, self)
+    node.parseXML(xmlelement)
 
-    self.nodes.append(node)
     self.nodeids[str(node.id())] = node
+    self.browsenames.setdefault(str(node.browseName()), []).append(node)
 
   def removeNodeById(self, nodeId):
     nd = self.getNodeByIDString(nodeId)
@@ -253,7 +250,7 @@ class opcua_namespace():
       return False
 
     logger.debug("Removing nodeId " + str(nodeId))
-    self.nodes.remove(nd)
+    self.__unregisterNode__(nd)
     if nd.getInverseReferences() != None:
       for ref in nd.getInverseReferences():
         src = ref.target();
@@ -286,28 +283,39 @@ class opcua_namespace():
 
         No return value
 
-        parseXML open the file xmldoc using xml.dom.minidom and searches for
-        the first UANodeSet Element. For every Element encountered, createNode
-        is called to instantiate a node of the appropriate type.
+        parseXML streams the file xmldoc using etree.iterparse and expects the
+        document root to be an UANodeSet Element. Every Element directly below
+        the root is handed to createNode as soon as it has been read completely
+        and is discarded afterwards, so only the XML subtree of a single node
+        is held in memory at any time.
+
+        XML namespace qualifiers are stripped from all tags while parsing, so
+        the node classes can compare against plain tag names.
     """
     typedict = {}
-    UANodeSet = dom.parse(xmldoc).getElementsByTagName("UANodeSet")
-    if len(UANodeSet) == 0:
-      logger.error( "Error: No NodeSets found")
-      return
-    if len(UANodeSet) != 1:
-      logger.error( "Error: Found more than 1 Nodeset in XML File")
+    UANodeSet = None
+    depth = 0
+    for (event, nd) in etree.iterparse(xmldoc, events=("start", "end")):
+      if event == "start":
+        depth = depth + 1
+        if depth == 1:
+          UANodeSet = nd
+          if nd.tag.rpartition("}")[2] != "UANodeSet":
+            logger.error( "Error: No NodeSets found")
+            return
+        continue
 
-    UANodeSet = UANodeSet[0]
-    for nd in UANodeSet.childNodes:
-      if nd.nodeType != nd.ELEMENT_NODE:
+      depth = depth - 1
+      nd.tag = nd.tag.rpartition("}")[2]
+      if depth != 1:
         continue
 
-      ndType = nd.tagName.lower()
+      ndType = nd.tag.lower()
       if ndType[:2] == "ua":
         ndType = ndType[2:]
       elif not ndType in self.knownNodeTypes:
         logger.warn("XML Element or NodeType " + ndType + " is unknown and will be ignored")
+        UANodeSet.clear()
         continue
 
       if not ndType in typedict:
@@ -316,6 +324,9 @@ class opcua_namespace():
         typedict[ndType] = typedict[ndType] + 1
 
       self.createNode(ndType, nd)
+      # Nodes keep references to the subelements they need (i.e. <Value>),
+      # everything else read so far can be released.
+      UANodeSet.clear()
     logger.debug("Currently " + str(len(self.nodes)) + " nodes in address space. Type distribution for this run was: " + str(typedict))
 
   def linkOpenPointers(self):
@@ -335,51 +346,55 @@ class opcua_namespace():
         unlinked references. The individual items in this list can be
         retrieved using getUnlinkedPointers().
     """
-    linked = []
+    unlinked = []
+    aliases = self.aliases
 
     logger.debug( str(self.unlinkedItemCount()) + " pointers need to get linked.")
     for l in self.__linkLater__:
       targetLinked = False
-      if not l.target() == None and not isinstance(l.target(), opcua_node_t):
-        if isinstance(l.target(),str) or isinstance(l.target(),unicode):
+      target = l.target()
+      if not target == None and not isinstance(target, opcua_node_t):
+        if isinstance(target,str) or isinstance(target,unicode):
           # If is not a node ID, it should be an alias. Try replacing it
           # with a proper node ID
-          if l.target() in self.aliases:
-            l.target(self.aliases[l.target()])
+          target = aliases.get(target, target)
+          l.target(target)
           # If the link is a node ID, try to find it hopening that no ass has
           # defined more than one kind of id for that sucker
-          if l.target()[:2] == "i=" or l.target()[:2] == "g=" or \
-             l.target()[:2] == "b=" or l.target()[:2] == "s=" or \
-             l.target()[:3] == "ns=" :
-            tgt = self.getNodeByIDString(str(l.target()))
+          if target[:2] in ("i=", "g=", "b=", "s=") or target[:3] == "ns=":
+            tgt = self.getNodeByIDString(str(target))
             if tgt == None:
-              logger.error("Failed to link pointer to target (node not found) " + l.target())
+              logger.error("Failed to link pointer to target (node not found) " + target)
             else:
               l.target(tgt)
               targetLinked = True
           else:
-            logger.error("Failed to link pointer to target (target not Alias or Node) " + l.target())
+            logger.error("Failed to link pointer to target (target not Alias or Node) " + target)
         else:
-          logger.error("Failed to link pointer to target (don't know dummy type + " + str(type(l.target())) + " +) " + str(l.target()))
+          logger.error("Failed to link pointer to target (don't know dummy type + " + str(type(target)) + " +) " + str(target))
       else:
         logger.error("Pointer has null target: " + str(l))
 
 
       referenceLinked = False
-      if not l.referenceType() == None:
-        if l.referenceType() in self.aliases:
-          l.referenceType(self.aliases[l.referenceType()])
-        tgt = self.getNodeByIDString(str(l.referenceType()))
+      refType = l.referenceType()
+      if not refType == None:
+        refType = aliases.get(refType, refType)
+        l.referenceType(refType)
+        tgt = self.getNodeByIDString(str(refType))
         if tgt == None:
-          logger.error("Failed to link reference type to target (node not found) " + l.referenceType())
+          logger.error("Failed to link reference type to target (node not found) " + refType)
         else:
           l.referenceType(tgt)
           referenceLinked = True
       else:
         referenceLinked = True
 
-      if referenceLinked == True and targetLinked == True:
-        linked.append(l)
+      # Pointers that failed to link are kept for the next attempt while
+      # iterating, instead of removing the linked ones in another pass
+      if referenceLinked == False or targetLinked == False:
+        unlinked.append(l)
+    self.__linkLater__ = unlinked
 
     # References marked as "not forward" must be inverted (removed from source node, assigned to target node and relinked)
     logger.warn("Inverting reference direction for all references with isForward==False attribute (is this correct!?)")
@@ -397,9 +412,6 @@ class opcua_namespace():
     for n in self.nodes:
       n.updateInverseReferences()
 
-    for l in linked:
-      self.__linkLater__.remove(l)
-
     if len(self.__linkLater__) != 0:
       logger.warn(str(len(self.__linkLater__)) + " could not be linked.")
 
@@ -455,6 +467,17 @@ class opcua_namespace():
     file.close()
 
   def getSubTypesOf(self, tdNodes = None, currentNode = None, hasSubtypeRefNode = None):
+    """ Returns a list of all nodes reachable from currentNode by following
+        forward HasSubtype references, appended to tdNodes if passed.
+
+        If currentNode is not passed, the subtypes of HasTypeDefinition are
+        collected and HasTypeDefinition itself is part of the list.
+
+        The hierarchy is walked depth first in the order references are
+        listed, using an explicit stack instead of recursion. Each node is
+        expanded and listed only once, even if the type hierarchy reaches it
+        over several paths.
+    """
     # If this is a toplevel call, collect the following information as defaults
     if tdNodes == None:
       tdNodes = []
@@ -468,11 +491,23 @@ class opcua_namespace():
       if hasSubtypeRefNode == None:
         return tdNodes
 
-    # collect all subtypes of this node
-    for ref in currentNode.getReferences():
-      if ref.isForward() and ref.referenceType().id() == hasSubtypeRefNode.id():
-        tdNodes.append(ref.target())
-        self.getTypeDefinitionNodes(tdNodes=tdNodes, currentNode = ref.target(), hasSubtypeRefNode=hasSubtypeRefNode)
+    # collect all subtypes of this node; the stack holds the iterators over
+    # the references of all nodes on the current path
+    hasSubtypeId = hasSubtypeRefNode.id()
+    expanded = set([id(currentNode)])
+    stack = [iter(currentNode.getReferences())]
+    while len(stack) > 0:
+      for ref in stack[-1]:
+        if ref.isForward() and ref.referenceType().id() == hasSubtypeId:
+          tgt = ref.target()
+          if id(tgt) in expanded:
+            continue
+          expanded.add(id(tgt))
+          tdNodes.append(tgt)
+          stack.append(iter(tgt.getReferences()))
+          break
+      else:
+        stack.pop()
 
     return tdNodes
 
@@ -531,32 +566,24 @@ class opcua_namespace():
     file.write("}\n")
     file.close()
 
-  def __reorder_getMinWeightNode__(self, nmatrix):
-    rcind = -1
-    rind = -1
-    minweight = -1
-    minweightnd = None
-    for row in nmatrix:
-      rcind += 1
-      if row[0] == None:
-        continue
-      w = sum(row[1:])
-      if minweight < 0:
-        rind = rcind
-        minweight = w
-        minweightnd = row[0]
-      elif w < minweight:
-        rind = rcind
-        minweight = w
-        minweightnd = row[0]
-    return (rind, minweightnd, minweight)
-
   def reorderNodesMinDependencies(self):
-    # create a matrix represtantion of all node
-    #
-    nmatrix = []
-    for n in range(0,len(self.nodes)):
-      nmatrix.append([None] + [0]*len(self.nodes))
+    """ Reorders the nodes of this namespace so that nodes are printed after
+        the nodes they depend on wherever possible.
+
+        No return value
+
+        Every node is weighted by its dependencies: 200 for each (forward)
+        HasTypeDefinition, 100 for each inverse HasSubtype and 1 for every
+        other forward reference targeting it from a node that has not been
+        placed yet. The node with the lowest weight is placed next (the first
+        one in the current order on ties), until all nodes are placed.
+
+        Weights are kept in a list indexed like the nodes, and the next node is
+        taken from a heap of (weight, index) entries instead of summing up a
+        node-by-node matrix for every step. Weights only ever decrease, so
+        outdated heap entries are skipped when they come up.
+    """
+    nodes = self.nodes
 
     typeRefs = []
     tn = self.getNodeByBrowseName("HasTypeDefinition")
@@ -568,54 +595,57 @@ class opcua_namespace():
     if tn  != None:
       subTypeRefs.append(tn)
       subTypeRefs = subTypeRefs + self.getSubTypesOf(currentNode=tn)
+    # Both are only used for membership tests on every reference below
+    typeRefs = frozenset(typeRefs)
+    subTypeRefs = frozenset(subTypeRefs)
 
-    logger.debug("Building connectivity matrix for node order optimization.")
-    # Set column 0 to contain the node
-    for node in self.nodes:
-      nind = self.nodes.index(node)
-      nmatrix[nind][0] = node
-
-    # Determine the dependencies of all nodes
     logger.debug("Determining node interdependencies.")
-    for node in self.nodes:
-      nind = self.nodes.index(node)
-      #print "Examining node " + str(nind) + " " + str(node)
+    # Node indices are looked up by object identity
+    nodeIndex = {}
+    for nind, node in enumerate(nodes):
+      nodeIndex[id(node)] = nind
+
+    weight = [0]*len(nodes)
+    dependants = [] # dependants[nind] lists the index of every node that has a regular dependency on node nind
+    for nind, node in enumerate(nodes):
+      deps = []
       for ref in node.getReferences():
         if isinstance(ref.target(), opcua_node_t):
-          tind = self.nodes.index(ref.target())
+          tind = nodeIndex[id(ref.target())]
           # Typedefinition of this node has precedence over this node
           if ref.referenceType() in typeRefs and ref.isForward():
-            nmatrix[nind][tind+1] += 200 # Very big weight for typedefs
+            weight[nind] += 200 # Very big weight for typedefs
           # isSubTypeOf/typeDefinition of this node has precedence over this node
           elif ref.referenceType() in subTypeRefs and not ref.isForward():
-            nmatrix[nind][tind+1] += 100 # Big weight for subtypes
+            weight[nind] += 100 # Big weight for subtypes
           # Else the target depends on us
           elif ref.isForward():
-            nmatrix[tind][nind+1] += 1 # regular weight for dependencies
+            weight[tind] += 1 # regular weight for dependencies
+            deps.append(tind)
+      dependants.append(deps)
 
     logger.debug("Using Djikstra topological sorting to determine printing order.")
+    placed = [False]*len(nodes)
+    candidates = [(w, nind) for nind, w in enumerate(weight)]
+    heapq.heapify(candidates)
     reorder = []
-    while len(reorder) < len(self.nodes):
-      (nind, node, w) = self.__reorder_getMinWeightNode__(nmatrix)
-      #print  str(100*float(len(reorder))/len(self.nodes)) + "% " + str(w) + " " + str(node) + " " + str(node.browseName())
-      reorder.append(node)
-      for ref in node.getReferences():
-        if isinstance(ref.target(), opcua_node_t):
-          tind = self.nodes.index(ref.target())
-          if ref.referenceType() in typeRefs and ref.isForward():
-            nmatrix[nind][tind+1] -= 200
-          elif ref.referenceType() in subTypeRefs and not ref.isForward():
-            nmatrix[nind][tind+1] -= 100
-          elif ref.isForward():
-            nmatrix[tind][nind+1] -= 1
-      nmatrix[nind][0] = None
-    self.nodes = reorder
+    while len(reorder) < len(nodes):
+      (w, nind) = heapq.heappop(candidates)
+      if placed[nind] or w != weight[nind]:
+        continue
+      placed[nind] = True
+      reorder.append(nodes[nind])
+      for tind in dependants[nind]:
+        weight[tind] -= 1
+        if not placed[tind]:
+          heapq.heappush(candidates, (weight[tind], tind))
+    self.nodeids = OrderedDict([(str(n.id()), n) for n in reorder])
     logger.debug("Nodes reordered.")
     return
 
   def printOpen62541Header(self, printedExternally=[], supressGenerationOfAttribute=[], outfilename=""):
-    unPrintedNodes = []
-    unPrintedRefs  = []
+    unPrintedNodes = set()
+    unPrintedRefs  = opcua_referencePointerList_t()
     code = []
     header = []
 
@@ -623,6 +653,11 @@ class opcua_namespace():
     logger.debug("Reordering nodes for minimal dependencies during printing.")
     self.reorderNodesMinDependencies()
 
+    # References do not change while printing, so getFirstParentNode() may use
+    # an index instead of scanning the references of each parent
+    for n in self.nodes:
+      n.buildReferenceTargetIndex()
+
     # Some macros (UA_EXPANDEDNODEID_MACRO()...) are easily created, but
     # bulky. This class will help to offload some code.
     codegen = open62541_MacroHelper(supressGenerationOfAttribute=supressGenerationOfAttribute)
@@ -632,10 +667,12 @@ class opcua_namespace():
     #   all printed references from these lists.
     for n in self.nodes:
       if not n in printedExternally:
-        unPrintedNodes.append(n)
+        unPrintedNodes.add(n)
       else:
         logger.debug("Node " + str(n.id()) + " is being ignored.")
-    for n in unPrintedNodes:
+    for n in self.nodes:
+      if not n in unPrintedNodes:
+        continue
       for r in n.getReferences():
         if (r.target() != None) and (r.target().id() != None) and (r.parent() != None):
           unPrintedRefs.append(r)
@@ -749,6 +786,9 @@ class opcua_namespace():
     else:
       logger.debug("Printing succeeded for all references")
 
+    for n in self.nodes:
+      n.clearReferenceTargetIndex()
+
     code.append("return UA_STATUSCODE_GOOD;")
     code.append("}")
     return (header,code)
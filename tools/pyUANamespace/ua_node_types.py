@@ -21,6 +21,7 @@
 ###
 
 import sys
+import re
 import logging
 from ua_builtin_types import *;
 from open62541_MacroHelper import open62541_MacroHelper
@@ -28,31 +29,40 @@ from ua_constants import *
 
 logger = logging.getLogger(__name__)
 
-def getNextElementNode(xmlvalue):
-  if xmlvalue == None:
-    return None
-  xmlvalue = xmlvalue.nextSibling
-  while not xmlvalue == None and not xmlvalue.nodeType == xmlvalue.ELEMENT_NODE:
-    xmlvalue = xmlvalue.nextSibling
-  return xmlvalue
+# Characters that are not permitted in C identifiers generated from node and
+# reference ids (see getCodePrintableID()); each one is replaced by "_".
+__codePrintableNodeIDJunk__ = re.compile("[^abcdefghijklmnopqrstuvwxyz1234567890_]")
+__codePrintableRefIDJunk__  = re.compile("[^abcdefghijklmopqrstuvwxyz0123456789]")
+
+# Lexical forms of boolean XML attribute values (xs:boolean), and the
+# conversions using them in the attribute tables of the node classes (see
+# opcua_node_t.parseXMLAttributes()).
+__xmlFalseValues__ = frozenset(["false", "False", "FALSE", "0"])
+__xmlTrueValues__  = frozenset(["true", "True", "TRUE", "1"])
+
+def __xmlIsNotFalse__(value):
+  return not value in __xmlFalseValues__
+
+def __xmlIsTrue__(value):
+  return value in __xmlTrueValues__
 
 ###
 ### References are not really described by OPC-UA. This is how we
 ### use them here.
 ###
 
-class opcua_referencePointer_t():
+class opcua_referencePointer_t(object):
   """ Representation of a pointer.
 
       A pointer consists of a target (which should be a node class),
       an optional reference type (which should be an instance of
       opcua_node_referenceType_t) and an optional isForward flag.
+
+      There is one instance per reference in the XML, so attributes are kept
+      in __slots__ instead of a per-instance __dict__.
   """
-  __reference_type__          = None
-  __target__                  = None
-  __isForward__               = True
-  __addr__                    = 0
-  __parentNode__              = None
+  __slots__ = ("__reference_type__", "__target__", "__isForward__", "__isHidden__",
+               "__addr__", "__parentNode__")
 
   def __init__(self, target, hidden=False, parentNode=None):
     self.__target__ = target
@@ -101,14 +111,7 @@ class opcua_referencePointer_t():
     if self.referenceType() != None:
       type = str(self.referenceType().id())
     tmp = src+"_"+type+"_"+tgt
-    tmp = tmp.lower()
-    refid = ""
-    for i in tmp:
-      if not i in "ABCDEFGHIJKLMOPQRSTUVWXYZ0123456789".lower():
-        refid = refid + ("_")
-      else:
-        refid = refid + i
-    return refid
+    return __codePrintableRefIDJunk__.sub("_", tmp.lower())
 
   def __str__(self):
     retval=""
@@ -145,33 +148,96 @@ class opcua_referencePointer_t():
   def __repr__(self):
       return self.__str__()
 
-  def __cmp__(self, other):
+  def __eq__(self, other):
+    """ References are equal if they point to the same target using the same
+        reference type and direction. The parent is not compared.
+
+        The attributes are compared directly instead of through their
+        accessors, as this is called for every list lookup of a reference.
+    """
     if not isinstance(other, opcua_referencePointer_t):
-      return -1
-    if other.target() == self.target():
-      if other.referenceType() == self.referenceType():
-        if other.isForward() == self.isForward():
-          return 0
-    return 1
+      return False
+    return self.__target__ == other.__target__ and \
+           self.__reference_type__ == other.__reference_type__ and \
+           self.__isForward__ == other.__isForward__
+
+  def __ne__(self, other):
+    return not self.__eq__(other)
+
+  def __hash__(self):
+    # Consistent with __eq__. Note that target and reference type are
+    # replaced by nodes during linking, which changes the hash.
+    return hash((self.__target__, self.__reference_type__, self.__isForward__))
+
+class opcua_referencePointerList_t():
+  """ Ordered collection of opcua_referencePointer_t instances.
+
+      Behaves like the list of references it replaces: iteration keeps the
+      order in which references were appended, and membership tests and
+      remove() use reference equality, remove() taking out the first equal
+      entry. Both are answered from a hash index instead of scanning the
+      list, so references must not be relinked while they are part of the
+      collection.
+  """
+  __refs__    = []
+  __index__   = {}
+  __targets__ = {}
+  __count__   = 0
+
+  def __init__(self, refs=[]):
+    self.__refs__    = [] # appended references, None for removed ones
+    self.__index__   = {} # reference:[positions in __refs__], ascending
+    self.__targets__ = {} # id(target):[positions in __refs__], ascending
+    self.__count__   = 0
+    for r in refs:
+      self.append(r)
+
+  def append(self, ref):
+    pos = len(self.__refs__)
+    self.__refs__.append(ref)
+    self.__index__.setdefault(ref, []).append(pos)
+    self.__targets__.setdefault(id(ref.target()), []).append(pos)
+    self.__count__ += 1
+
+  def remove(self, ref):
+    positions = self.__index__.get(ref, None)
+    if not positions:
+      raise ValueError("reference not in list")
+    self.__refs__[positions.pop(0)] = None
+    if len(positions) == 0:
+      del self.__index__[ref]
+    self.__count__ -= 1
+
+  def referencesTo(self, node):
+    """ Returns the references targeting node, in list order.
+    """
+    refs = self.__refs__
+    return [refs[pos] for pos in self.__targets__.get(id(node), []) if refs[pos] != None]
+
+  def __contains__(self, ref):
+    return ref in self.__index__
+
+  def __iter__(self):
+    for r in self.__refs__:
+      if r != None:
+        yield r
+
+  def __len__(self):
+    return self.__count__
 
 
 ###
 ### Node ID's as a builtin type are useless. using this one instead.
 ###
 
-class opcua_node_id_t():
+class opcua_node_id_t(object):
   """ Implementation of a node ID.
 
       The ID will encoding itself appropriatly as string. If multiple ID's (numeric, string, guid)
       are defined, the order of preference for the ID string is always numeric, guid,
       bytestring, string. Binary encoding only applies to numeric values (UInt16).
   """
-  i = -1
-  o = ""
-  g = ""
-  s = ""
-  ns = 0
-  __mystrname__ = ""
+  __slots__ = ("i", "b", "g", "s", "ns", "__mystrname__")
 
   def __init__(self, idstring):
     idparts = idstring.split(";")
@@ -223,9 +289,17 @@ class opcua_node_id_t():
     return self.__mystrname__
 
   def __eq__(self, nodeId2):
-    if not nodeId2:
-        return False
-    return (self.toString() == nodeId2.toString())
+    if not isinstance(nodeId2, opcua_node_id_t):
+      return False
+    return self.__mystrname__ == nodeId2.__mystrname__
+
+  def __ne__(self, nodeId2):
+    return not self.__eq__(nodeId2)
+
+  def __hash__(self):
+    # Consistent with __eq__. The preprocessor reassigns namespace indices
+    # and calls toString() afterwards, which changes the hash.
+    return hash(self.__mystrname__)
 
   def __repr__(self):
     return self.__mystrname__
@@ -235,6 +309,20 @@ class opcua_node_id_t():
 ###
 
 class opcua_node_t:
+  # XML attributes handled by parseXML() as 'attribute':(setter, conversion);
+  # a setter of None ignores the attribute, a conversion of None passes the
+  # value on unchanged. Subclasses list their own attributes in
+  # __xmlSubTypeAttributes__ for parseXMLSubType().
+  __xmlAttributes__ = { "NodeId":        (None, None),
+                        "BrowseName":    ("browseName", str),
+                        "DisplayName":   ("displayName", None),
+                        "Description":   ("description", None),
+                        "WriteMask":     ("writeMask", int),
+                        "UserWriteMask": ("userWriteMask", int),
+                        "EventNotifier": ("eventNotifier", int),
+                        "ParentNodeId":  (None, None) }
+  __xmlSubTypeAttributes__ = {}
+
   __node_id__             = None
   __node_class__          = 0
   __node_browseName__     = ""
@@ -245,6 +333,7 @@ class opcua_node_t:
   __node_namespace__      = None
   __node_references__     = []
   __node_referencedBy__   = []
+  __node_referenceTargets__ = None
   __binary__              = ""
   __address__             = 0
 
@@ -259,6 +348,7 @@ class opcua_node_t:
     self.__node_userWriteMask__  = 0
     self.__node_references__     = []
     self.__node_referencedBy__   = []
+    self.__node_referenceTargets__ = None
     self.__init_subType__()
     self.FLAG_ISABSTRACT       = 128
     self.FLAG_SYMMETRIC        = 64
@@ -290,14 +380,7 @@ class opcua_node_t:
     else:
       CodePrintable = self.__class__.__name__ + "_unknown_nid"
 
-    CodePrintable = CodePrintable.lower()
-    cleanPrintable = ""
-    for i in range(0,len(CodePrintable)):
-      if not CodePrintable[i] in "ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890_".lower():
-        cleanPrintable = cleanPrintable + "_"
-      else:
-        cleanPrintable = cleanPrintable + CodePrintable[i]
-    return cleanPrintable
+    return __codePrintableNodeIDJunk__.sub("_", CodePrintable.lower())
 
   def addReference(self, ref):
     """ Add a opcua_referencePointer_t to the list of
@@ -365,25 +448,54 @@ class opcua_node_t:
 
         Note that there may be more than one nodes that reference this node.
         The parent returned will be determined by the first isInverse()
-        Reference of this node found. If none exists, the first hidden
-        reference will be returned.
+        Reference of this node found. Hidden references are only held in the
+        inverse reference list (see addInverseReferenceTarget()) and are never
+        considered.
+
+        The reference of the parent is found with getReferenceTo().
     """
     parent = None
     revref = None
 
-    for hiddenstatus in [False, True]:
-      for r in self.getReferences():
-        if r.isHidden() == hiddenstatus and r.isForward() == False:
-          parent = r.target()
-          for r in parent.getReferences():
-            if r.target() == self:
-              revref = r
-              break
-          if revref != None:
-            return (parent, revref)
+    for r in self.getReferences():
+      if r.isForward() == False:
+        parent = r.target()
+        revref = parent.getReferenceTo(self)
+        if revref != None:
+          return (parent, revref)
 
     return (parent, revref)
 
+  def getReferenceTo(self, node):
+    """ Returns the first reference of this node targeting node, or None.
+
+        If buildReferenceTargetIndex() has been called, this is a single
+        lookup instead of a scan over all references.
+    """
+    if self.__node_referenceTargets__ != None:
+      return self.__node_referenceTargets__.get(id(node), None)
+    for r in self.getReferences():
+      if r.target() == node:
+        return r
+    return None
+
+  def buildReferenceTargetIndex(self):
+    """ Indexes the first reference of this node to each of its targets for
+        getReferenceTo().
+
+        The index is not updated when references are added, removed or
+        relinked; use clearReferenceTargetIndex() before changing them.
+    """
+    index = {}
+    for r in self.getReferences():
+      key = id(r.target())
+      if not key in index:
+        index[key] = r
+    self.__node_referenceTargets__ = index
+
+  def clearReferenceTargetIndex(self):
+    self.__node_referenceTargets__ = None
+
   def updateInverseReferences(self):
     """ Updates inverse references in all nodes referenced by this node.
 
@@ -471,22 +583,21 @@ class opcua_node_t:
         for linkLater(), which will eventually replace the string target
         with an actual instance of an opcua_node_t.
     """
-    if not xmlelement.tagName == "References":
+    if not xmlelement.tag == "References":
       logger.error("XMLElement passed is not a reference list")
       return
-    for ref in xmlelement.childNodes:
-      if ref.nodeType == ref.ELEMENT_NODE:
-        dummy = opcua_referencePointer_t(unicode(ref.firstChild.data), parentNode=self)
-        self.addReference(dummy)
-        self.getNamespace().linkLater(dummy)
-        for (at, av) in ref.attributes.items():
-          if at == "ReferenceType":
-            dummy.referenceType(av)
-          elif at == "IsForward":
-            if "false" in av.lower():
-              dummy.isForward(False)
-          else:
-            logger.error("Don't know how to process attribute " + at + "(" + av + ") for references.")
+    for ref in xmlelement:
+      dummy = opcua_referencePointer_t(unicode(ref.text), parentNode=self)
+      self.addReference(dummy)
+      self.getNamespace().linkLater(dummy)
+      for (at, av) in ref.attrib.items():
+        if at == "ReferenceType":
+          dummy.referenceType(av)
+        elif at == "IsForward":
+          if av in __xmlFalseValues__:
+            dummy.isForward(False)
+        else:
+          logger.error("Don't know how to process attribute " + at + "(" + av + ") for references.")
 
   def printDot(self):
     cleanname = "node_" + str(self.id()).replace(";","").replace("=","")
@@ -585,54 +696,51 @@ class opcua_node_t:
         from this base type and will be called automatically.
     """
     thisxml = xmlelement
-    for (at, av) in thisxml.attributes.items():
-      if at == "NodeId":
-        xmlelement.removeAttribute(at)
-      elif at == "BrowseName":
-        self.browseName(str(av))
-        xmlelement.removeAttribute(at)
-      elif at == "DisplayName":
-        self.displayName(av)
-        xmlelement.removeAttribute(at)
-      elif at == "Description":
-        self.description(av)
-        xmlelement.removeAttribute(at)
-      elif at == "WriteMask":
-        self.writeMask(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "UserWriteMask":
-        self.userWriteMask(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "EventNotifier":
-        self.eventNotifier(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "ParentNodeId":
-        # Silently ignore this one..
-        xmlelement.removeAttribute(at)
-
-    for x in thisxml.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        if x.firstChild:
-          if   x.tagName == "BrowseName":
-            self.browseName(unicode(x.firstChild.data))
-            xmlelement.removeChild(x)
-          elif x.tagName == "DisplayName":
-            self.displayName(unicode(x.firstChild.data))
-            xmlelement.removeChild(x)
-          elif x.tagName == "Description":
-            self.description(unicode(x.firstChild.data))
-            xmlelement.removeChild(x)
-          elif x.tagName == "WriteMask":
-            self.writeMask(int(unicode(x.firstChild.data)))
-            xmlelement.removeChild(x)
-          elif x.tagName == "UserWriteMask":
-            self.userWriteMask(int(unicode(x.firstChild.data)))
-            xmlelement.removeChild(x)
-        if x.tagName == "References":
-          self.initiateDummyXMLReferences(x)
-          xmlelement.removeChild(x)
+    self.parseXMLAttributes(thisxml, self.__xmlAttributes__)
+
+    for x in list(thisxml):
+      if x.text != None:
+        if   x.tag == "BrowseName":
+          self.browseName(unicode(x.text))
+          xmlelement.remove(x)
+        elif x.tag == "DisplayName":
+          self.displayName(unicode(x.text))
+          xmlelement.remove(x)
+        elif x.tag == "Description":
+          self.description(unicode(x.text))
+          xmlelement.remove(x)
+        elif x.tag == "WriteMask":
+          self.writeMask(int(unicode(x.text)))
+          xmlelement.remove(x)
+        elif x.tag == "UserWriteMask":
+          self.userWriteMask(int(unicode(x.text)))
+          xmlelement.remove(x)
+      if x.tag == "References":
+        self.initiateDummyXMLReferences(x)
+        xmlelement.remove(x)
     self.parseXMLSubType(xmlelement)
 
+  def parseXMLAttributes(self, xmlelement, handlers):
+    """ Applies all attributes of xmlelement that are listed in handlers (see
+        __xmlAttributes__) to this node and removes them from xmlelement.
+
+        Returns a list of (attribute, value) tuples of the attributes that
+        are not listed in handlers. These are left in xmlelement.
+    """
+    unknown = []
+    for (at, av) in list(xmlelement.attrib.items()):
+      handler = handlers.get(at, None)
+      if handler == None:
+        unknown.append((at, av))
+        continue
+      (setter, conversion) = handler
+      if setter != None:
+        if conversion != None:
+          av = conversion(av)
+        getattr(self, setter)(av)
+      del xmlelement.attrib[at]
+    return unknown
+
   def parseXMLSubType(self, xmlelement):
     pass
 
@@ -720,9 +828,9 @@ class opcua_node_t:
     # Again, but this time check if other nodes deffered their node creation because this node did
     # not exist...
     tmprefs = []
-    for r in unPrintedReferences:
+    for r in unPrintedReferences.referencesTo(self):
       #logger.debug("Checking if another reference " + str(r.target()) + "can be created...")
-      if (r.target() == self) and not (r.parent() in unPrintedNodes):
+      if not (r.parent() in unPrintedNodes):
         if not isinstance(r.parent(), opcua_node_t):
           logger.debug("Reference has no parent!")
         elif not isinstance(r.parent().id(), opcua_node_id_t):
@@ -745,6 +853,10 @@ class opcua_node_t:
     return code
 
 class opcua_node_referenceType_t(opcua_node_t):
+  __xmlSubTypeAttributes__ = { "Symmetric":   ("symmetric", __xmlIsNotFalse__),
+                               "InverseName": ("inverseName", str),
+                               "IsAbstract":  ("isAbstract", __xmlIsNotFalse__) }
+
   __isAbstract__    = False
   __symmetric__     = False
   __reference_inverseName__   = ""
@@ -785,31 +897,14 @@ class opcua_node_referenceType_t(opcua_node_t):
     return True
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
-      if at == "Symmetric":
-        if "false" in av.lower():
-          self.symmetric(False)
-        else:
-          self.symmetric(True)
-        xmlelement.removeAttribute(at)
-      elif at == "InverseName":
-        self.inverseName(str(av))
-        xmlelement.removeAttribute(at)
-      elif at == "IsAbstract":
-        if "false" in str(av).lower():
-          self.isAbstract(False)
-        else:
-          self.isAbstract(True)
-        xmlelement.removeAttribute(at)
-      else:
-        logger.warn("Don't know how to process attribute " + at + " (" + av + ")")
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
+      logger.warn("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        if x.tagName == "InverseName" and x.firstChild:
-          self.inverseName(str(unicode(x.firstChild.data)))
-        else:
-          logger.warn( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      if x.tag == "InverseName" and x.text != None:
+        self.inverseName(str(unicode(x.text)))
+      else:
+        logger.warn( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_Subtype(self, unPrintedReferences=[], bootstrapping = True):
     code = []
@@ -852,6 +947,9 @@ class opcua_node_referenceType_t(opcua_node_t):
 
 
 class opcua_node_object_t(opcua_node_t):
+  __xmlSubTypeAttributes__ = { "EventNotifier": ("eventNotifier", int),
+                               "SymbolicName":  (None, None) }
+
   __object_eventNotifier__ = 0
 
   def __init_subType__(self):
@@ -864,19 +962,11 @@ class opcua_node_object_t(opcua_node_t):
     return self.__object_eventNotifier__
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
-      if at == "EventNotifier":
-        self.eventNotifier(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "SymbolicName":
-        # Silently ignore this one
-        xmlelement.removeAttribute(at)
-      else:
-        logger.error("Don't know how to process attribute " + at + " (" + av + ")")
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
+      logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_Subtype(self, unPrintedReferences=[], bootstrapping = True):
     code = []
@@ -917,6 +1007,12 @@ if sys.version_info[0] >= 3:
     return s
 
 class opcua_node_variable_t(opcua_node_t):
+  __xmlSubTypeAttributes__ = { "ValueRank":               ("valueRank", int),
+                               "AccessLevel":             ("accessLevel", int),
+                               "UserAccessLevel":         ("userAccessLevel", int),
+                               "MinimumSamplingInterval": ("minimumSamplingInterval", float),
+                               "SymbolicName":            (None, None) }
+
   __value__               = 0
   __dataType__            = None
   __valueRank__           = 0
@@ -1021,57 +1117,41 @@ class opcua_node_variable_t(opcua_node_t):
     return True
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
-      if at == "ValueRank":
-        self.valueRank(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "AccessLevel":
-        self.accessLevel(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "UserAccessLevel":
-        self.userAccessLevel(int(av))
-        xmlelement.removeAttribute(at)
-      elif at == "MinimumSamplingInterval":
-        self.minimumSamplingInterval(float(av))
-        xmlelement.removeAttribute(at)
-      elif at == "DataType":
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
+      if at == "DataType":
         self.dataType(opcua_referencePointer_t(str(av), parentNode=self))
         # dataType needs to be linked to a node once the namespace is read
         self.getNamespace().linkLater(self.dataType())
-        xmlelement.removeAttribute(at)
-      elif at == "SymbolicName":
-        # Silently ignore this one
-        xmlelement.removeAttribute(at)
+        del xmlelement.attrib[at]
       else:
         logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        if x.tagName == "Value":
-          # We need to be able to parse the DataType to build the variable value,
-          # which can only be done if the namespace is linked.
-          # Store the Value for later parsing
-          self.__xmlValueDef__ = x
-          #logger.debug( "Value description stored for later elaboration.")
-        elif x.tagName == "DataType":
-          self.dataType(opcua_referencePointer_t(str(av), parentNode=self))
-          # dataType needs to be linked to a node once the namespace is read
-          self.getNamespace().linkLater(self.dataType())
-        elif x.tagName == "ValueRank":
-          self.valueRank(int(unicode(x.firstChild.data)))
-        elif x.tagName == "ArrayDimensions":
-          self.arrayDimensions(int(unicode(x.firstChild.data)))
-        elif x.tagName == "AccessLevel":
-          self.accessLevel(int(unicode(x.firstChild.data)))
-        elif x.tagName == "UserAccessLevel":
-          self.userAccessLevel(int(unicode(x.firstChild.data)))
-        elif x.tagName == "MinimumSamplingInterval":
-          self.minimumSamplingInterval(float(unicode(x.firstChild.data)))
-        elif x.tagName == "Historizing":
-          if "true" in x.firstChild.data.lower():
-            self.historizing(True)
-        else:
-          logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      if x.tag == "Value":
+        # We need to be able to parse the DataType to build the variable value,
+        # which can only be done if the namespace is linked.
+        # Store the Value for later parsing
+        self.__xmlValueDef__ = x
+        #logger.debug( "Value description stored for later elaboration.")
+      elif x.tag == "DataType":
+        self.dataType(opcua_referencePointer_t(str(av), parentNode=self))
+        # dataType needs to be linked to a node once the namespace is read
+        self.getNamespace().linkLater(self.dataType())
+      elif x.tag == "ValueRank":
+        self.valueRank(int(unicode(x.text)))
+      elif x.tag == "ArrayDimensions":
+        self.arrayDimensions(int(unicode(x.text)))
+      elif x.tag == "AccessLevel":
+        self.accessLevel(int(unicode(x.text)))
+      elif x.tag == "UserAccessLevel":
+        self.userAccessLevel(int(unicode(x.text)))
+      elif x.tag == "MinimumSamplingInterval":
+        self.minimumSamplingInterval(float(unicode(x.text)))
+      elif x.tag == "Historizing":
+        if "true" in x.text.lower():
+          self.historizing(True)
+      else:
+        logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_SubtypeEarly(self, bootstrapping = True):
     code = []
@@ -1148,7 +1228,7 @@ class opcua_node_method_t(opcua_node_t):
       pass
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
+    for (at, av) in xmlelement.attrib.items():
       if at == "MethodDeclarationId":
         self.methodDeclaration(opcua_referencePointer_t(str(av), parentNode=self))
         # dataType needs to be linked to a node once the namespace is read
@@ -1156,9 +1236,8 @@ class opcua_node_method_t(opcua_node_t):
       else:
         logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_Subtype(self, unPrintedReferences=[], bootstrapping = True):
     code = []
@@ -1196,17 +1275,16 @@ class opcua_node_objectType_t(opcua_node_t):
     return self.__isAbstract__
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
       if at == "IsAbstract":
-        if "false" in av.lower():
+        if av in __xmlFalseValues__:
           self.isAbstract(False)
-        xmlelement.removeAttribute(at)
+        del xmlelement.attrib[at]
       else:
         logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_Subtype(self, unPrintedReferences=[], bootstrapping = True):
     code = []
@@ -1247,6 +1325,8 @@ class opcua_node_objectType_t(opcua_node_t):
     return code
 
 class opcua_node_variableType_t(opcua_node_t):
+  __xmlSubTypeAttributes__ = { "IsAbstract": ("isAbstract", __xmlIsNotFalse__) }
+
   __value__ = 0
   __dataType__ = None
   __valueRank__ = 0
@@ -1303,18 +1383,12 @@ class opcua_node_variableType_t(opcua_node_t):
       return False
 
   def parseXMLSubType(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
-      if at == "IsAbstract":
-        if "false" in av.lower():
-          self.isAbstract(False)
-        else:
-          self.isAbstract(True)
-        xmlelement.removeAttribute(at)
-      elif at == "ValueRank":
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
+      if at == "ValueRank":
         self.valueRank(int(av))
         if self.valueRank() != -1:
           logger.warn("Array's or matrices are only permitted in variables and not supported for variableTypes. This attribute (" + at + "=" + av + ") will effectively be ignored.")
-        xmlelement.removeAttribute(at)
+        del xmlelement.attrib[at]
       elif at == "DataType":
         self.dataType(opcua_referencePointer_t(str(av), parentNode=self))
         # dataType needs to be linked to a node once the namespace is read
@@ -1322,13 +1396,12 @@ class opcua_node_variableType_t(opcua_node_t):
       else:
         logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        if x.tagName == "Definition":
-          self.__xmlDefinition__ = x
-          logger.debug( "Definition stored for future processing")
-        else:
-          logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      if x.tag == "Definition":
+        self.__xmlDefinition__ = x
+        logger.debug( "Definition stored for future processing")
+      else:
+        logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_SubtypeEarly(self, bootstrapping = True):
     code = []
@@ -1393,6 +1466,8 @@ class opcua_node_dataType_t(opcua_node_t):
 
       If encodable, the encoding can be retrieved using getEncoding().
   """
+  __xmlSubTypeAttributes__ = { "IsAbstract": ("isAbstract", __xmlIsTrue__) }
+
   __isAbstract__ = False
   __isEnum__     = False
   __xmlDefinition__ = None
@@ -1544,60 +1619,59 @@ class opcua_node_dataType_t(opcua_node_t):
     typeDict = []
 
     # An XML Definition is provided and will be parsed... now
-    for x in self.__xmlDefinition__.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        fname  = ""
-        fdtype = ""
-        enumVal = ""
-        hasValueRank = 0
-        for at,av in x.attributes.items():
-          if at == "DataType":
-            fdtype = str(av)
-            isEnum = False
-          elif at == "Name":
-            fname = str(av)
-          elif at == "Value":
-            enumVal = int(av)
-            isSubType = False
-          elif at == "ValueRank":
-            hasValueRank = int(av)
-            logger.warn("Arrays or matrices (ValueRank) are not supported for datatypes. This DT will become scalar.")
-          else:
-            logger.warn("Unknown Field Attribute " + str(at))
-        # This can either be an enumeration OR a structure, not both.
-        # Figure out which of the dictionaries gets the newly read value pair
-        if isEnum == isSubType:
-          # This is an error
-          logger.warn("DataType contains both enumeration and subtype (or neither)")
+    for x in self.__xmlDefinition__:
+      fname  = ""
+      fdtype = ""
+      enumVal = ""
+      hasValueRank = 0
+      for at,av in x.attrib.items():
+        if at == "DataType":
+          fdtype = str(av)
+          isEnum = False
+        elif at == "Name":
+          fname = str(av)
+        elif at == "Value":
+          enumVal = int(av)
+          isSubType = False
+        elif at == "ValueRank":
+          hasValueRank = int(av)
+          logger.warn("Arrays or matrices (ValueRank) are not supported for datatypes. This DT will become scalar.")
+        else:
+          logger.warn("Unknown Field Attribute " + str(at))
+      # This can either be an enumeration OR a structure, not both.
+      # Figure out which of the dictionaries gets the newly read value pair
+      if isEnum == isSubType:
+        # This is an error
+        logger.warn("DataType contains both enumeration and subtype (or neither)")
+        self.__encodable__ = False
+        break
+      elif isEnum:
+        # This is an enumeration
+        enumDict.append((fname, enumVal))
+        continue
+      else:
+        # This might be a subtype... follow the node defined as datatype to find out
+        # what encoding to use
+        dtnode = self.getNamespace().getNodeByIDString(fdtype)
+        if dtnode == None:
+          # Node found in datatype element is invalid
+          logger.debug( prefix + fname + " ?? " + av + " ??")
           self.__encodable__ = False
-          break
-        elif isEnum:
-          # This is an enumeration
-          enumDict.append((fname, enumVal))
-          continue
         else:
-          # This might be a subtype... follow the node defined as datatype to find out
-          # what encoding to use
-          dtnode = self.getNamespace().getNodeByIDString(fdtype)
-          if dtnode == None:
-            # Node found in datatype element is invalid
-            logger.debug( prefix + fname + " ?? " + av + " ??")
+          # The node in the datatype element was found. we inherit its encoding,
+          # but must still ensure that the dtnode is itself validly encodable
+          typeDict.append([fname, dtnode])
+          if hasValueRank < 0:
+            hasValueRank = 0
+          fdtype = str(dtnode.browseName()) + "+"*hasValueRank
+          logger.debug( prefix + fname + " : " + fdtype + " -> " + str(dtnode.id()))
+          subenc = dtnode.buildEncoding(indent=indent+1)
+          self.__baseTypeEncoding__ = self.__baseTypeEncoding__ + [[fname, subenc, hasValueRank]]
+          if not dtnode.isEncodable():
+            # If we inherit an encoding from an unencodable not, this node is
+            # also not encodable
             self.__encodable__ = False
-          else:
-            # The node in the datatype element was found. we inherit its encoding,
-            # but must still ensure that the dtnode is itself validly encodable
-            typeDict.append([fname, dtnode])
-            if hasValueRank < 0:
-              hasValueRank = 0
-            fdtype = str(dtnode.browseName()) + "+"*hasValueRank
-            logger.debug( prefix + fname + " : " + fdtype + " -> " + str(dtnode.id()))
-            subenc = dtnode.buildEncoding(indent=indent+1)
-            self.__baseTypeEncoding__ = self.__baseTypeEncoding__ + [[fname, subenc, hasValueRank]]
-            if not dtnode.isEncodable():
-              # If we inherit an encoding from an unencodable not, this node is
-              # also not encodable
-              self.__encodable__ = False
-              break
+            break
 
     # If we used inheritance to determine an encoding without alias, there is a
     # the possibility that lists got double-nested despite of only one element
@@ -1629,23 +1703,15 @@ class opcua_node_dataType_t(opcua_node_t):
         XML attributes fields processed are "isAbstract"
         XML elements processed are "Definition"
     """
-    for (at, av) in xmlelement.attributes.items():
-      if at == "IsAbstract":
-        if "true" in str(av).lower():
-          self.isAbstract(True)
-        else:
-          self.isAbstract(False)
-        xmlelement.removeAttribute(at)
-      else:
-        logger.warn("Don't know how to process attribute " + at + " (" + av + ")")
+    for (at, av) in self.parseXMLAttributes(xmlelement, self.__xmlSubTypeAttributes__):
+      logger.warn("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        if x.tagName == "Definition":
-          self.__xmlDefinition__ = x
-          #logger.debug( "Definition stored for future processing")
-        else:
-          logger.warn( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      if x.tag == "Definition":
+        self.__xmlDefinition__ = x
+        #logger.debug( "Definition stored for future processing")
+      else:
+        logger.warn( "Unprocessable XML Element: " + x.tag)
 
   def encodedTypeId(self):
     """ Returns a number of the builtin Type that should be used
@@ -1732,13 +1798,12 @@ class opcua_node_view_t(opcua_node_t):
       self.__eventNotifier__ = data
     return self.__eventNotifier__
 
-  def parseXMLSubtype(self, xmlelement):
-    for (at, av) in xmlelement.attributes.items():
+  def parseXMLSubType(self, xmlelement):
+    for (at, av) in xmlelement.attrib.items():
       logger.error("Don't know how to process attribute " + at + " (" + av + ")")
 
-    for x in xmlelement.childNodes:
-      if x.nodeType == x.ELEMENT_NODE:
-        logger.info( "Unprocessable XML Element: " + x.tagName)
+    for x in xmlelement:
+      logger.info( "Unprocessable XML Element: " + x.tag)
 
   def printOpen62541CCode_Subtype(self, unPrintedReferences=[], bootstrapping = True):
     code = []